@@ -1,6 +1,196 @@
+import weakref
+
 import fastf1 as ff1
+import numpy as np
 import pandas as pd
 
+# Attribute under which derived frames are memoized on each session. Cached
+# frames (and session.laps) reference the session back, so the memo lives on
+# the session itself: the cycle is then collected along with the session.
+_CACHE_ATTR = '_fastf1_utils_cache'
+
+# Sessions this module has already loaded, so they are only loaded once.
+_LOADED_SESSIONS = weakref.WeakSet()
+
+# NaT viewed as int64 nanoseconds.
+_NAT = np.iinfo(np.int64).min
+# Sentinel cumulative time (ns) for laps without a recorded lap time.
+_NO_TIME = np.iinfo(np.int64).max
+
+def _ensure_loaded(session):
+    """
+    Loads a session, unless this module has already loaded it.
+
+    Args:
+        session: The fastf1 session object.
+    """
+    if session not in _LOADED_SESSIONS:
+        session.load()
+        _LOADED_SESSIONS.add(session)
+
+def _cached(session, key, compute):
+    """
+    Returns compute(session), memoized per session under the given key.
+
+    An entry is recomputed if session.laps has been replaced since it was
+    stored (e.g. by loading the session again).
+
+    Args:
+        session: The fastf1 session object.
+        key: A hashable name for the cached value.
+        compute: A function taking the session and returning the value.
+
+    Returns:
+        The cached or freshly computed value.
+    """
+    entries = getattr(session, _CACHE_ATTR, None)
+    if entries is None:
+        entries = {}
+        setattr(session, _CACHE_ATTR, entries)
+    laps = session.laps
+    if key in entries and entries[key][0] is laps:
+        return entries[key][1]
+    value = compute(session)
+    entries[key] = (laps, value)
+    return value
+
+def _lap_time_ns(laps):
+    """
+    Gets the lap times of a laps DataFrame as int64 nanoseconds.
+
+    Args:
+        laps: A fastf1 laps DataFrame.
+
+    Returns:
+        A numpy int64 array, with missing lap times (NaT) as the int64 minimum.
+    """
+    return laps['LapTime'].to_numpy().astype('timedelta64[ns]').view('i8')
+
+def _cumulative_time_ns(driver_codes, lap_numbers, lap_time_ns):
+    """
+    Computes each driver's running total of lap times.
+
+    Args:
+        driver_codes: Integer driver code per row.
+        lap_numbers: Lap number per row.
+        lap_time_ns: Lap time per row as int64 nanoseconds, NaT as the int64 minimum.
+
+    Returns:
+        The cumulative time per row (in the input row order) as int64
+        nanoseconds, with _NO_TIME where the lap time is missing.
+    """
+    # Sort by driver, then lap, so each driver's laps form one contiguous run
+    order = np.lexsort((lap_numbers, driver_codes))
+    codes = driver_codes[order]
+    lap_ns = lap_time_ns[order]
+    valid = lap_ns != _NAT
+    lap_ns = np.where(valid, lap_ns, 0)
+
+    # One global cumsum, rebased at each driver's first lap
+    cum_ns = np.cumsum(lap_ns)
+    driver_starts = np.flatnonzero(np.diff(codes, prepend=-1) != 0)
+    driver_runs = np.diff(np.append(driver_starts, len(codes)))
+    cum_ns -= np.repeat(cum_ns[driver_starts] - lap_ns[driver_starts], driver_runs)
+
+    cumulative = np.empty_like(cum_ns)
+    cumulative[order] = np.where(valid, cum_ns, _NO_TIME)
+    return cumulative
+
+def _leader_idx(driver_codes, lap_numbers, lap_time_ns):
+    """
+    Finds the row of the leader (minimum cumulative time) for each lap number.
+
+    Args:
+        driver_codes: Integer driver code per row.
+        lap_numbers: Lap number per row.
+        lap_time_ns: Lap time per row as int64 nanoseconds, NaT as the int64 minimum.
+
+    Returns:
+        A tuple of the leader row indices (ordered by lap number) and the
+        leader's cumulative time in nanoseconds at each of those laps.
+    """
+    cum_ns = _cumulative_time_ns(driver_codes, lap_numbers, lap_time_ns)
+
+    # Order rows by lap number, then cumulative time: each lap's first row is its leader
+    order = np.lexsort((cum_ns, lap_numbers))
+    _, first = np.unique(lap_numbers[order], return_index=True)
+    leader_rows = order[first]
+    # Laps without a lap time can never be the leader's lap
+    leader_rows = leader_rows[cum_ns[leader_rows] != _NO_TIME]
+
+    return leader_rows, cum_ns[leader_rows]
+
+def _compute_leader_laps(session):
+    """
+    Finds the leader's lap (minimum cumulative race time) for each lap number.
+
+    Args:
+        session: The fastf1 session object, already loaded.
+
+    Returns:
+        A laps DataFrame with one row per lap number and an added
+        'CumulativeTime' column.
+    """
+    laps = session.laps
+    if laps.empty:
+        return laps.assign(CumulativeTime=laps['LapTime'])
+
+    driver_codes, _ = pd.factorize(laps['Driver'])
+    rows, cum_ns = _leader_idx(driver_codes, laps['LapNumber'].to_numpy(), _lap_time_ns(laps))
+
+    return laps.iloc[rows].assign(CumulativeTime=cum_ns.view('timedelta64[ns]'))
+
+def _leader_laps(session):
+    """
+    Gets the leader's laps for a session, cached per session.
+
+    The returned frame is shared between callers and must not be modified.
+
+    Args:
+        session: The fastf1 session object.
+
+    Returns:
+        A laps DataFrame with one row per lap number and an added
+        'CumulativeTime' column.
+    """
+    _ensure_loaded(session)
+    return _cached(session, 'leader_laps', _compute_leader_laps)
+
+def _compute_weather_data_by_lap(session):
+    """
+    Matches each of the leader's laps to the closest weather data sample.
+
+    Args:
+        session: The fastf1 session object, already loaded.
+
+    Returns:
+        A pandas DataFrame with lap number and corresponding weather data.
+    """
+    leader_laps = _leader_laps(session).sort_values(by='Time')
+    weather_data = session.weather_data.sort_values(by='Time')
+
+    weather_columns = ['AirTemp', 'Humidity', 'Pressure', 'Rainfall', 'TrackTemp', 'WindDirection', 'WindSpeed']
+    weather_ns = weather_data['Time'].to_numpy().astype('timedelta64[ns]').view('i8')
+    lap_ns = leader_laps['Time'].to_numpy().astype('timedelta64[ns]').view('i8')
+
+    if len(weather_ns) == 0:
+        # No weather samples: still one row per lap, with missing weather values
+        weather_laps = pd.DataFrame(np.nan, index=pd.RangeIndex(len(lap_ns)), columns=weather_columns)
+    else:
+        # Closest weather sample to each lap; ties go to the earlier sample
+        after = np.searchsorted(weather_ns, lap_ns, side='right')
+        before = np.clip(after - 1, 0, None)
+        after = np.clip(after, None, len(weather_ns) - 1)
+        use_after = np.abs(weather_ns[after] - lap_ns) < np.abs(lap_ns - weather_ns[before])
+        nearest = np.where(use_after, after, before)
+
+        # Select relevant columns
+        weather_laps = weather_data[weather_columns].take(nearest, axis=0).reset_index(drop=True)
+
+    weather_laps.insert(0, 'LapNumber', leader_laps['LapNumber'].to_numpy())
+
+    return weather_laps
+
 def get_track_status_by_lap(session):
     """
     Gets the track status for each lap of a session, based on the leader's perspective.
@@ -19,11 +209,7 @@ def get_track_status_by_lap(session):
     Returns:
         A pandas DataFrame with lap number and the track status at that lap.
     """
-    session.load()
-    laps = session.laps.copy()
-    laps['CumulativeTime'] = laps.groupby('Driver')['LapTime'].cumsum()
-    leader_laps = laps.loc[laps.groupby('LapNumber')['CumulativeTime'].idxmin()]
-    track_status = leader_laps.loc[:, ["LapNumber", "TrackStatus"]]
+    track_status = _leader_laps(session).loc[:, ["LapNumber", "TrackStatus"]]
     return track_status
 
 def get_weather_data_by_lap(session):
@@ -36,30 +222,8 @@ def get_weather_data_by_lap(session):
     Returns:
         A pandas DataFrame with lap number and corresponding weather data.
     """
-    session.load()
-    laps = session.laps.copy()
-    weather_data = session.weather_data
-
-    # Find leader laps
-    laps['CumulativeTime'] = laps.groupby('Driver')['LapTime'].cumsum()
-    leader_laps = laps.loc[laps.groupby('LapNumber')['CumulativeTime'].idxmin()]
-
-    # Sort by time for merge_asof
-    leader_laps = leader_laps.sort_values(by='Time')
-    weather_data = weather_data.sort_values(by='Time')
-
-    # Merge weather data based on the closest time
-    weather_laps = pd.merge_asof(
-        leader_laps[['LapNumber', 'Time']],
-        weather_data,
-        on='Time',
-        direction='nearest'
-    )
-
-    # Select relevant columns
-    weather_laps = weather_laps[['LapNumber', 'AirTemp', 'Humidity', 'Pressure', 'Rainfall', 'TrackTemp', 'WindDirection', 'WindSpeed']]
-
-    return weather_laps
+    _ensure_loaded(session)
+    return _cached(session, 'weather_by_lap', _compute_weather_data_by_lap).copy()
 
 
 if __name__ == '__main__':
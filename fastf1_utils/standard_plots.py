@@ -4,40 +4,146 @@ import numpy as np
 import pandas as pd
 import fastf1.plotting
 from fastf1.utils import delta_time
-from new_utils import get_track_status_by_lap, get_weather_data_by_lap
+from new_utils import (
+    get_track_status_by_lap,
+    get_weather_data_by_lap,
+    _cached,
+    _ensure_loaded,
+    _leader_laps,
+    _lap_time_ns,
+    _cumulative_time_ns,
+    _NAT,
+    _NO_TIME,
+)
+
+def _driver_style(session, driver):
+    """
+    Gets the line color and style for a driver, cached per session.
 
-def plot_track_status_highlights(ax, session):
+    Args:
+        session: The fastf1 session object, already loaded.
+        driver: The driver abbreviation (e.g., 'VER').
+
+    Returns:
+        A dict of matplotlib line style keyword arguments.
     """
-    Adds colored background highlights to a plot based on track status (SC/VSC).
+    return _cached(
+        session,
+        ('driver_style', driver),
+        lambda session: fastf1.plotting.get_driver_style(driver, style=['color', 'linestyle'], session=session)
+    )
+
+def _status_mask(track_status, statuses):
+    """
+    Flags the rows whose track status is exactly one of the given codes.
+
+    Track status values can combine several codes (e.g. '14'), so the test
+    is an exact match, run once per distinct value and mapped back to rows.
+
+    Args:
+        track_status: A 'TrackStatus' column.
+        statuses: The track status codes to flag (e.g. ['6', '7']).
+
+    Returns:
+        A boolean numpy array with one value per row.
+    """
+    codes, uniques = pd.factorize(track_status)
+    # Missing statuses have code -1, which picks up the trailing False
+    return np.append(uniques.isin(statuses), False)[codes]
+
+def _lap_spans(lap_numbers):
+    """
+    Collapses lap numbers into contiguous spans covering each whole lap.
+
+    Args:
+        lap_numbers: The lap numbers to cover.
+
+    Returns:
+        A list of (start, width) tuples, one per run of consecutive laps.
+    """
+    laps = np.unique(np.asarray(lap_numbers, dtype=float))
+    if len(laps) == 0:
+        return []
+    runs = np.split(laps, np.flatnonzero(np.diff(laps) != 1) + 1)
+    return [(run[0] - 0.5, run[-1] - run[0] + 1) for run in runs]
+
+def _highlight_spans(ax, spans, **kwargs):
+    """
+    Shades full-height vertical bands over the given lap spans as a single artist.
 
     Args:
         ax: The matplotlib axes object to add the highlights to.
+        spans: A list of (start, width) tuples, as returned by _lap_spans.
+        **kwargs: Style arguments passed on to ax.broken_barh.
+    """
+    if spans:
+        # x in data coordinates, y spanning the full axes height (like axvspan)
+        ax.broken_barh(spans, (0, 1), transform=ax.get_xaxis_transform(), **kwargs)
+
+def _track_status_spans(session):
+    """
+    Gets the Safety Car and Virtual Safety Car lap spans of a session.
+
+    Args:
         session: The fastf1 session object.
+
+    Returns:
+        A tuple of the SC spans and the VSC spans, each as returned by _lap_spans.
     """
     track_status_df = get_track_status_by_lap(session)
-    sc_laps = track_status_df[track_status_df['TrackStatus'].isin(['4'])]['LapNumber']
-    vsc_laps = track_status_df[track_status_df['TrackStatus'].isin(['6', '7'])]['LapNumber']
+    sc_laps = track_status_df['LapNumber'][_status_mask(track_status_df['TrackStatus'], ['4'])]
+    vsc_laps = track_status_df['LapNumber'][_status_mask(track_status_df['TrackStatus'], ['6', '7'])]
+    return _lap_spans(sc_laps), _lap_spans(vsc_laps)
+
+def _rainfall_spans(session, rainfall_threshold):
+    """
+    Gets the spans of laps with rainfall at or above a threshold.
+
+    Args:
+        session: The fastf1 session object.
+        rainfall_threshold: The rainfall value (in mm) above which a lap counts as rainy.
+
+    Returns:
+        A list of (start, width) tuples, as returned by _lap_spans.
+    """
+    weather_df = get_weather_data_by_lap(session)
+    return _lap_spans(weather_df[weather_df['Rainfall'] >= rainfall_threshold]['LapNumber'])
 
-    for lap in sc_laps:
-        ax.axvspan(lap - 0.5, lap + 0.5, color='yellow', alpha=0.3)
+def plot_track_status_highlights(ax, session):
+    """
+    Adds colored background highlights to a plot based on track status (SC/VSC).
+
+    The highlighted spans are computed once per session and reused by later calls.
+
+    Args:
+        ax: The matplotlib axes object to add the highlights to.
+        session: The fastf1 session object.
+    """
+    _ensure_loaded(session)
+    sc_spans, vsc_spans = _cached(session, 'track_status_spans', _track_status_spans)
 
-    for lap in vsc_laps:
-        ax.axvspan(lap - 0.5, lap + 0.5, color='orange', alpha=0.3)
+    _highlight_spans(ax, sc_spans, color='yellow', alpha=0.3)
+    _highlight_spans(ax, vsc_spans, color='orange', alpha=0.3)
 
 def plot_rainfall_highlights(ax, session, rainfall_threshold=0.1):
     """
     Adds a blue background highlight to a plot for laps with rainfall above a threshold.
 
+    The highlighted spans are computed once per session and threshold.
+
     Args:
         ax: The matplotlib axes object to add the highlights to.
         session: The fastf1 session object.
         rainfall_threshold: The rainfall value (in mm) above which to highlight laps.
     """
-    weather_df = get_weather_data_by_lap(session)
-    rainy_laps = weather_df[weather_df['Rainfall'] >= rainfall_threshold]['LapNumber']
+    _ensure_loaded(session)
+    rainy_spans = _cached(
+        session,
+        ('rainfall_spans', rainfall_threshold),
+        lambda session: _rainfall_spans(session, rainfall_threshold)
+    )
 
-    for lap in rainy_laps:
-        ax.axvspan(lap - 0.5, lap + 0.5, color='blue', alpha=0.2)
+    _highlight_spans(ax, rainy_spans, color='blue', alpha=0.2)
 
 def plot_race_trace(session, relative_to='average', drivers_to_plot=None):
     """
@@ -48,38 +154,46 @@ def plot_race_trace(session, relative_to='average', drivers_to_plot=None):
         relative_to: A string that can be a driver's code (e.g., 'VER'),
                      'leader', or 'average' (default).
     """
-    session.load()
-    laps = session.laps.copy()
-    
-    # Convert object-dtype columns with boolean values to bool
-    for col in laps.columns:
-        if laps[col].dtype == 'object' and all(isinstance(x, bool) or pd.isna(x) for x in laps[col].unique()):
-            laps[col] = laps[col].astype(bool)
+    _ensure_loaded(session)
+    laps = session.laps
 
-    # Calculate cumulative time for each driver
-    laps['CumulativeTime'] = laps.groupby('Driver')['LapTime'].cumsum()
+    # Calculate cumulative time for each driver, in integer nanoseconds
+    driver_codes, _ = pd.factorize(laps['Driver'])
+    cum_ns = _cumulative_time_ns(driver_codes, laps['LapNumber'].to_numpy(), _lap_time_ns(laps))
+    cumulative = np.where(cum_ns == _NO_TIME, np.nan, cum_ns)
+
+    # One row per lap, one column per driver (float ns, NaN where missing).
+    # Only the two key columns are taken, so the session's laps are never copied.
+    wide = laps[['Driver', 'LapNumber']].assign(CumulativeTime=cumulative).pivot(
+        index='LapNumber', columns='Driver', values='CumulativeTime'
+    )
 
     if relative_to == 'average':
         # Calculate the average cumulative time for each lap
-        reference_times = laps.groupby('LapNumber')['CumulativeTime'].mean()
+        reference_times = wide.mean(axis=1)
         title = "Race Progression Relative to Average"
         ylabel = "Time Delta to Average (s)"
     elif relative_to == 'leader':
-        # Find the leader (minimum cumulative time) at each lap
-        leader_laps = laps.loc[laps.groupby('LapNumber')['CumulativeTime'].idxmin()]
-        reference_times = leader_laps.set_index('LapNumber')['CumulativeTime']
+        # Reuse the (cached) leader laps shared with the track status lookup
+        leader_laps = _leader_laps(session)
+        leader_ns = leader_laps['CumulativeTime'].to_numpy().astype('timedelta64[ns]').view('i8')
+        reference_times = pd.Series(leader_ns, index=leader_laps['LapNumber'].to_numpy())
         title = "Race Gaps to Leader"
         ylabel = "Gap to Leader (s)"
     else:
         # Use a specific driver as the reference
-        driver_laps = laps[laps['Driver'] == relative_to]
-        if driver_laps.empty:
+        if relative_to not in wide.columns:
             print(f"Driver {relative_to} not found.")
             return
-        reference_times = driver_laps.set_index('LapNumber')['CumulativeTime']
+        reference_times = wide[relative_to]
         title = f"Race Gaps Relative to {relative_to}"
         ylabel = f"Gap to {relative_to} (s)"
 
+    # Align the reference to the pivot's laps once, then broadcast across drivers.
+    # Gaps are converted to seconds only here.
+    reference_ns = reference_times.reindex(wide.index).to_numpy(dtype=float)
+    gaps_s = (wide.to_numpy() - reference_ns[:, np.newaxis]) * 1e-9
+
     fig, ax = plt.subplots(figsize=(15, 10))
     ax.set_title(title)
     ax.set_xlabel("Lap Number")
@@ -90,20 +204,9 @@ def plot_race_trace(session, relative_to='average', drivers_to_plot=None):
     driver_abbreviations = drivers_to_plot if drivers_to_plot else laps['Driver'].unique()
 
     for driver in driver_abbreviations:
-        driver_laps = laps[laps['Driver'] == driver]
-
-        if not driver_laps.empty:
-            # Use a merge to align driver laps with the reference time for each lap
-            gaps_df = pd.merge(driver_laps[['LapNumber', 'CumulativeTime']],
-                               reference_times.rename('ReferenceTime'),
-                               on='LapNumber',
-                               how='inner')
-
-            # Calculate the gap in seconds
-            gaps_df['Gap'] = (gaps_df['CumulativeTime'] - gaps_df['ReferenceTime']).dt.total_seconds()
-
-            driver_style = fastf1.plotting.get_driver_style(driver, style=['color', 'linestyle'], session=session)
-            ax.plot(gaps_df['LapNumber'], gaps_df['Gap'], label=driver, **driver_style)
+        if driver in wide.columns:
+            driver_style = _driver_style(session, driver)
+            ax.plot(wide.index, gaps_s[:, wide.columns.get_loc(driver)], label=driver, **driver_style)
 
     ax.legend()
     ax.grid(True)
@@ -130,44 +233,56 @@ def plot_telemetry_comparison(session, lap_1_driver, lap_2_driver, lap_1_number,
     Returns:
         The matplotlib figure and axes objects.
     """
-    session.load()
-    
-    lap1 = session.laps.pick_drivers(lap_1_driver).pick_lap(lap_1_number)
-    lap2 = session.laps.pick_drivers(lap_2_driver).pick_lap(lap_2_number)
+    _ensure_loaded(session)
+    laps = session.laps
+
+    lap1 = laps.pick_drivers(lap_1_driver).pick_lap(lap_1_number)
+    lap2 = laps.pick_drivers(lap_2_driver).pick_lap(lap_2_number)
 
     tel1 = lap1.get_telemetry()
     tel2 = lap2.get_telemetry()
 
-    # Calculate time delta
-    delta_t, ref_tel, cmp_tel = delta_time(lap1, lap2)
+    # Calculate time delta (only when it is plotted, as it re-derives both laps' telemetry)
+    if 'TimeDelta' in plots_to_show:
+        delta_t, ref_tel, cmp_tel = delta_time(lap1, lap2)
+        delta_x = ref_tel['Distance'].to_numpy()
+        delta_y = delta_t.to_numpy()
+
+    # Materialize the shared x arrays and the requested channels once
+    x1 = tel1['Distance'].to_numpy()
+    x2 = tel2['Distance'].to_numpy()
+    channels = [plot_type for plot_type in plots_to_show if plot_type != 'TimeDelta']
+    data1 = {channel: tel1[channel].to_numpy() for channel in channels}
+    data2 = {channel: tel2[channel].to_numpy() for channel in channels}
+    if 'Brake' in data1:
+        data1['Brake'] = data1['Brake'].astype(np.uint8)
+        data2['Brake'] = data2['Brake'].astype(np.uint8)
 
     fig, axes = plt.subplots(len(plots_to_show), 1, figsize=(15, 5 * len(plots_to_show)), sharex=True)
     
     fig.suptitle(f"Telemetry Comparison: {lap_1_driver} Lap {lap_1_number} vs. {lap_2_driver} Lap {lap_2_number}", size=16)
 
-    plot_map = {
-        'Speed': {'y_label': 'Speed (km/h)', 'data1': tel1['Speed'], 'data2': tel2['Speed']},
-        'Throttle': {'y_label': 'Throttle (%)', 'data1': tel1['Throttle'], 'data2': tel2['Throttle']},
-        'Brake': {'y_label': 'Brake', 'data1': tel1['Brake'], 'data2': tel2['Brake']},
-        'TimeDelta': {'y_label': f'Time Delta ({lap_2_driver} to {lap_1_driver})', 'data1': delta_t, 'data2': None}
+    y_labels = {
+        'Speed': 'Speed (km/h)',
+        'Throttle': 'Throttle (%)',
+        'Brake': 'Brake',
+        'TimeDelta': f'Time Delta ({lap_2_driver} to {lap_1_driver})'
     }
 
-    driver_style_1 = fastf1.plotting.get_driver_style(lap1['Driver'], style=['color', 'linestyle'], session=session)
-    driver_style_2 = fastf1.plotting.get_driver_style(lap2['Driver'], style=['color', 'linestyle'], session=session)
+    driver_style_1 = _driver_style(session, lap1['Driver'])
+    driver_style_2 = _driver_style(session, lap2['Driver'])
 
     for i, plot_type in enumerate(plots_to_show):
         ax = axes[i] if len(plots_to_show) > 1 else axes
-        plot_info = plot_map[plot_type]
 
         if plot_type == 'TimeDelta':
-            ax.plot(ref_tel['Distance'], plot_info['data1'], label=f'Time Delta ({lap_2_driver} to {lap_1_driver})', color='white')
+            ax.plot(delta_x, delta_y, label=f'Time Delta ({lap_2_driver} to {lap_1_driver})', color='white')
             ax.axhline(0, color='white', linestyle='--', linewidth=1)
         else:
-            ax.plot(tel1['Distance'], plot_info['data1'], label=f'{lap_1_driver} Lap {lap_1_number}', **driver_style_1)
-            if plot_info['data2'] is not None:
-                ax.plot(tel2['Distance'], plot_info['data2'], label=f'{lap_2_driver} Lap {lap_2_number}', **driver_style_2)
+            ax.plot(x1, data1[plot_type], label=f'{lap_1_driver} Lap {lap_1_number}', **driver_style_1)
+            ax.plot(x2, data2[plot_type], label=f'{lap_2_driver} Lap {lap_2_number}', **driver_style_2)
         
-        ax.set_ylabel(plot_info['y_label'])
+        ax.set_ylabel(y_labels[plot_type])
         ax.legend()
         ax.grid(True)
 
@@ -180,6 +295,44 @@ def plot_telemetry_comparison(session, lap_1_driver, lap_2_driver, lap_1_number,
     return fig, axes
 
 
+def _stints(laps):
+    """
+    Finds the first and last lap of every stint in a laps DataFrame.
+
+    A stint is a run of consecutive laps by one driver with the same stint
+    number and compound. Laps without a stint number or compound are ignored.
+
+    Args:
+        laps: A fastf1 laps DataFrame.
+
+    Returns:
+        A pandas DataFrame with 'Driver', 'Stint', 'Compound', 'min' and 'max'
+        columns, one row per stint.
+    """
+    laps = laps.dropna(subset=['Stint', 'Compound'])
+    driver_codes, _ = pd.factorize(laps['Driver'])
+    compound_codes, _ = pd.factorize(laps['Compound'])
+    lap_numbers = laps['LapNumber'].to_numpy()
+
+    # Sort by driver, then lap, and start a new run wherever any key changes
+    order = np.lexsort((lap_numbers, driver_codes))
+    stint_numbers = laps['Stint'].to_numpy()[order]
+    new_run = (
+        (np.diff(driver_codes[order], prepend=-1) != 0)
+        | (np.diff(stint_numbers, prepend=np.nan) != 0)
+        | (np.diff(compound_codes[order], prepend=-1) != 0)
+    )
+    starts = np.flatnonzero(new_run)
+    lap_numbers = lap_numbers[order]
+
+    return pd.DataFrame({
+        'Driver': laps['Driver'].to_numpy()[order][starts],
+        'Stint': stint_numbers[starts],
+        'Compound': laps['Compound'].to_numpy()[order][starts],
+        'min': np.minimum.reduceat(lap_numbers, starts),
+        'max': np.maximum.reduceat(lap_numbers, starts),
+    })
+
 def plot_tyre_strategy(session, drivers_to_plot=None):
     """
     Plots the tyre strategy for each driver in the session.
@@ -189,45 +342,52 @@ def plot_tyre_strategy(session, drivers_to_plot=None):
         drivers_to_plot: A list of driver abbreviations to plot.
                          If None, all drivers are plotted.
     """
-    session.load()
+    _ensure_loaded(session)
     laps = session.laps
 
     if drivers_to_plot is None:
         drivers_to_plot = [session.get_driver(driver_id)['Abbreviation'] for driver_id in session.drivers]
 
-    stints = laps[['Driver', 'Stint', 'Compound', 'LapNumber']]
-    stints = stints.groupby(['Driver', 'Stint', 'Compound'])['LapNumber'].agg(['min', 'max']).reset_index()
-    stints = stints[stints['Driver'].isin(drivers_to_plot)]
+    # Categorical keys, so the driver filter and stint detection work on integer codes
+    laps = laps[['Driver', 'Stint', 'Compound', 'LapNumber']].astype({'Driver': 'category', 'Compound': 'category'})
+    stints = _stints(laps[laps['Driver'].isin(drivers_to_plot)])
 
-    fig, ax = plt.subplots(figsize=(15, 10))
+    # One row per driver that has stints, in the requested order
+    stint_drivers = set(stints['Driver'])
+    plotted_drivers = [driver for driver in drivers_to_plot if driver in stint_drivers]
+    rows = stints['Driver'].map({driver: i for i, driver in enumerate(plotted_drivers)}).to_numpy()
+    starts = stints['min'].to_numpy()
+    widths = stints['max'].to_numpy() - starts + 1
+    compounds = stints['Compound'].to_numpy()
 
-    for driver in drivers_to_plot:
-        driver_stints = stints[stints['Driver'] == driver]
-        for _, stint in driver_stints.iterrows():
-            start = stint['min']
-            end = stint['max']
-            compound = stint['Compound']
-            
-            ax.barh(
-                y=driver,
-                width=end - start + 1,
-                left=start,
-                color=ff1.plotting.COMPOUND_COLORS.get(compound, '#FFFFFF'),
-                edgecolor="black",
-                fill=True,
-                height=0.6
-            )
-            ax.text(
-                x=start + (end - start + 1) / 2,
-                y=driver,
-                s=compound,
-                ha='center',
-                va='center',
-                color='black',
-                fontsize=10,
-                fontweight='bold'
-            )
+    fig, ax = plt.subplots(figsize=(15, 10))
 
+    # One barh call per compound rather than one per stint
+    for compound in pd.unique(compounds):
+        is_compound = compounds == compound
+        ax.barh(
+            y=rows[is_compound],
+            width=widths[is_compound],
+            left=starts[is_compound],
+            color=ff1.plotting.COMPOUND_COLORS.get(compound, '#FFFFFF'),
+            edgecolor="black",
+            fill=True,
+            height=0.6
+        )
+
+    for x, row, compound in zip(starts + widths / 2, rows, compounds):
+        ax.text(
+            x=x,
+            y=row,
+            s=compound,
+            ha='center',
+            va='center',
+            color='black',
+            fontsize=10,
+            fontweight='bold'
+        )
+
+    ax.set_yticks(range(len(plotted_drivers)), plotted_drivers)
     ax.set_title(f'{session.event.year} {session.event.EventName} - Tyre Strategy')
     ax.set_xlabel("Lap Number")
     ax.set_ylabel("Driver")
@@ -260,7 +420,7 @@ def plot_lap_times(session, drivers_to_plot=None, ignore_pit_laps=True, ignore_s
                                 will be excluded from the plot.
         ignore_first_lap: If True, the first lap will be excluded.
     """
-    session.load()
+    _ensure_loaded(session)
     laps = session.laps
 
     if drivers_to_plot is None:
@@ -271,18 +431,32 @@ def plot_lap_times(session, drivers_to_plot=None, ignore_pit_laps=True, ignore_s
         # sc_vsc_laps = track_status_df[track_status_df['TrackStatus'].isin(['4', '6', '7'])]['LapNumber']
         # laps = laps[~laps['LapNumber'].isin(sc_vsc_laps)]
 
+    # Filter the whole frame once rather than per driver
+    mask = np.ones(len(laps), dtype=bool)
+    if ignore_first_lap:
+        mask &= laps['LapNumber'].to_numpy() > 1
+    if ignore_safety_car_laps:
+        mask &= ~_status_mask(laps['TrackStatus'], ['4', '6', '7'])
+    if ignore_pit_laps:
+        mask &= pd.isna(laps['PitInTime'].to_numpy()) & pd.isna(laps['PitOutTime'].to_numpy())
+    laps = laps[mask]
+
+    lap_numbers = laps['LapNumber'].to_numpy()
+    lap_time_ns = _lap_time_ns(laps)
+    lap_times = np.where(lap_time_ns == _NAT, np.nan, lap_time_ns * 1e-9)
+
+    # Row positions of each driver's laps, in their original order
+    driver_codes, drivers = pd.factorize(laps['Driver'])
+    order = np.argsort(driver_codes, kind='stable')
+    bounds = np.searchsorted(driver_codes[order], np.arange(len(drivers) + 1))
+    driver_rows = {driver: order[bounds[i]:bounds[i + 1]] for i, driver in enumerate(drivers)}
+
     fig, ax = plt.subplots(figsize=(15, 10))
 
     for driver in drivers_to_plot:
-        driver_laps = laps.pick_drivers(driver)
-        if ignore_first_lap:
-            driver_laps = driver_laps[driver_laps['LapNumber'] > 1]
-        if ignore_safety_car_laps:
-            driver_laps = driver_laps[~driver_laps['TrackStatus'].isin(['4', '6', '7'])]
-        if ignore_pit_laps:
-            driver_laps = driver_laps.loc[driver_laps['PitInTime'].isnull() & driver_laps['PitOutTime'].isnull()]
-        driver_style = fastf1.plotting.get_driver_style(driver, style=['color', 'linestyle'], session=session)
-        ax.plot(driver_laps['LapNumber'], driver_laps['LapTime'].dt.total_seconds(), label=driver, **driver_style)
+        rows = driver_rows.get(driver, np.array([], dtype=int))
+        driver_style = _driver_style(session, driver)
+        ax.plot(lap_numbers[rows], lap_times[rows], label=driver, **driver_style)
 
     ax.set_title(f'{session.event.year} {session.event.EventName} - Lap Times')
     ax.set_xlabel("Lap Number")